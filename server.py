@@ -3,25 +3,44 @@
 
 Serves static frontend files plus API endpoints:
 - GET /api/calls
+- GET /api/label/{incident_number}
 - GET /api/refresh
 - GET /health
 """
 
 import asyncio
+import gzip
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field, is_dataclass, replace
 from datetime import datetime, timezone
+from functools import lru_cache
+from math import isfinite
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
+from starlette.datastructures import Headers
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is the fallback
+    orjson = None
+
+try:
+    import h2  # noqa: F401 -- only needed so httpx can negotiate HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # --- Configuration ---
 HOST = os.environ.get("HOST", "0.0.0.0")  # Bind to all interfaces by default for container friendliness
@@ -30,6 +49,11 @@ REFRESH_INTERVAL_MS = int(os.environ.get("REFRESH_INTERVAL_MS", "120000"))
 MAX_GEOCODES_PER_REFRESH = int(os.environ.get("MAX_GEOCODES_PER_REFRESH", "8"))
 FAILED_RETRY_INTERVAL_MS = int(os.environ.get("FAILED_RETRY_INTERVAL_MS", str(6 * 60 * 60 * 1000)))
 GEOCODE_DELAY_MS = int(os.environ.get("GEOCODE_DELAY_MS", "1100"))
+GEOCODE_WORKERS = max(1, int(os.environ.get("GEOCODE_WORKERS", "3")))
+# Longer than the frontend's 15s poll, so an open tab keeps reusing one connection
+KEEP_ALIVE_SECONDS = 20
+# Auto-reload is a development aid: it adds a file-watcher process
+RELOAD = os.environ.get("RELOAD", "").lower() in ("1", "true", "yes")
 DALLAS_CALLS_URL = os.environ.get(
     "DALLAS_CALLS_URL",
     "https://www.dallasopendata.com/resource/9fxf-t2tr.json?$limit=800&$order=time%20DESC",
@@ -41,24 +65,99 @@ GEOCODER_USER_AGENT = os.environ.get(
 APP_ROOT = Path(__file__).resolve().parent
 PUBLIC_DIR = APP_ROOT / "public"
 DATA_DIR = APP_ROOT / "data"
-CACHE_FILE = DATA_DIR / "geocode-cache.json"
+CACHE_DB = DATA_DIR / "geocode-cache.sqlite"
+LEGACY_CACHE_FILE = DATA_DIR / "geocode-cache.json"  # Imported once into CACHE_DB
 
 REFRESH_INTERVAL_SECONDS = REFRESH_INTERVAL_MS / 1000
 GEOCODE_DELAY_SECONDS = GEOCODE_DELAY_MS / 1000
 FAILED_RETRY_INTERVAL_SECONDS = FAILED_RETRY_INTERVAL_MS / 1000
 
+# 5 decimal places is ~1 m, plenty for map pins and shorter in the JSON
+COORD_DECIMALS = 5
+
+# Static assets up to this size are kept in memory between requests
+STATIC_MEMORY_CACHE_MAX_BYTES = 1024 * 1024
+STATIC_CACHE_CONTROL = "public, max-age=60"
+
+# Cache persistence is batched: flush after this many writes or this much dirty time
+PERSIST_CHECK_SECONDS = 5.0
+PERSIST_MAX_PENDING_WRITES = 20
+PERSIST_MAX_DIRTY_SECONDS = 10.0
+
+
+_SLASH_RE = re.compile(r"\s*/\s*")
+
+INTERN_MAX_LENGTH = 32
+INTERN_MAX_ENTRIES = 10000
+_string_intern: dict[str, str] = {}
+
 
 # --- Data Structures & State ---
 
+@dataclass(frozen=True, slots=True)
+class ClientCall:
+    """One active-call row as sent to the frontend (field names are the JSON keys)."""
+    incidentNumber: str
+    division: str
+    natureOfCall: str
+    priority: str
+    date: str
+    time: str
+    unitNumber: str
+    block: str
+    location: str
+    beat: str
+    reportingArea: str
+    status: str
+    address: Optional[str]
+    lat: Optional[float]
+    lon: Optional[float]
+
+
+# (address, client coordinates, needs geocoding) -- see lookup_geocode
+AddressLookup = tuple[Optional[str], Optional[dict[str, Any]], bool]
+
+# (ClientCall field, Dallas Open Data column) pairs copied through normalize_space
+CLIENT_TEXT_FIELDS = (
+    ("incidentNumber", "incident_number"),
+    ("division", "division"),
+    ("natureOfCall", "nature_of_call"),
+    ("priority", "priority"),
+    ("date", "date"),
+    ("time", "time"),
+    ("unitNumber", "unit_number"),
+    ("beat", "beat"),
+    ("reportingArea", "reporting_area"),
+    ("status", "status"),
+)
+
+
 @dataclass
 class AppState:
-    calls: List[dict[str, Any]] = field(default_factory=list)
+    # Replaced wholesale on every update and never mutated, so readers can
+    # use the current list without taking the lock
+    calls: List[ClientCall] = field(default_factory=list)
+    # Cache key -> indexes into `calls` of every row at that address
+    call_index: dict[str, List[int]] = field(default_factory=dict)
+    mapped_count: int = 0
     geocode_cache: dict[str, dict[str, Any]] = field(default_factory=dict)
     last_updated_at: Optional[str] = None
     last_error: Optional[str] = None
+    calls_payload_bytes: Optional[bytes] = None
+    calls_payload_etag: Optional[str] = None
+    calls_payload_gzip: Optional[bytes] = None
     geocode_attempts_this_run: int = 0
     refresh_in_flight: bool = False
+    refresh_requested: asyncio.Event = field(default_factory=asyncio.Event)
+    geocode_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    geocode_pending: set[str] = field(default_factory=set)
+    dirty_since: Optional[float] = None
+    dirty_keys: set[str] = field(default_factory=set)
+    writes_since_flush: int = 0
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Shared Nominatim rate limiter: one request per GEOCODE_DELAY_SECONDS overall
+    geocode_rate_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_geocode_request_at: float = 0.0
 
 STATE = AppState()
 
@@ -70,19 +169,44 @@ def utc_now_iso() -> str:
 
 
 def normalize_space(value: Any) -> str:
-    return re.sub(r"\s+", " ", str(value or "").strip())
+    # split()/join() collapses the same whitespace as re's \s+, without the regex
+    text = " ".join(str(value or "").split())
+    if len(text) > INTERN_MAX_LENGTH:
+        return text
+    # Short values (division, priority, status, beat...) repeat across rows;
+    # share one string object per distinct value
+    if len(_string_intern) >= INTERN_MAX_ENTRIES:
+        _string_intern.clear()
+    return _string_intern.setdefault(text, text)
 
 
 def safe_float(value: Any) -> Optional[float]:
-    try:
-        number = float(value)
-    except (TypeError, ValueError):
-        return None
-    if number == float("inf") or number == float("-inf"):
-        return None
-    if number != number:  # NaN check
-        return None
-    return number
+    # Cached coordinates are already floats; skip the conversion for them
+    if value.__class__ is not float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+    return value if isfinite(value) else None
+
+
+def _json_default(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def loads_json(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps_json(value: Any) -> bytes:
+    # orjson encodes dataclasses natively; stdlib json needs the default hook
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default).encode("utf-8")
 
 
 def parse_iso(value: Optional[str]) -> Optional[float]:
@@ -99,31 +223,45 @@ def get_cache_key(address: str) -> str:
     return normalize_space(address).lower()
 
 
-def build_address(call: dict[str, Any]) -> Optional[str]:
-    block = normalize_space(call.get("block"))
-    location = normalize_space(call.get("location"))
+def build_address(block: str, location: str) -> Optional[str]:
+    """Builds a geocodable address from already-normalized block/location."""
     if not location:
         return None
 
-    normalized_location = re.sub(r"\s*/\s*", " & ", location)
+    normalized_location = _SLASH_RE.sub(" & ", location)
     if block:
         return f"{block} {normalized_location}, Dallas, TX"
     return f"{normalized_location}, Dallas, TX"
 
 
-def read_geo_from_cache(address: Optional[str]) -> Optional[dict[str, Any]]:
+def lookup_geocode(address: Optional[str]) -> tuple[Optional[dict[str, Any]], bool]:
+    """One cache lookup answering both questions a fetch asks about an address.
+
+    Returns (client coordinates or None, whether to (re)try geocoding it).
+    """
     if not address:
-        return None
-    key = get_cache_key(address)
-    cached = STATE.geocode_cache.get(key)
+        return None, False
+
+    cached = STATE.geocode_cache.get(get_cache_key(address))
+
+    # 1. New address -> geocode it
     if not cached:
-        return None
+        return None, True
 
-    lat = safe_float(cached.get("lat"))
-    lon = safe_float(cached.get("lon"))
-    if lat is None or lon is None:
-        return None
-    return {"lat": lat, "lon": lon, "geocodeLabel": cached.get("label", "")}
+    # Entries are validated when written (geocode result or SQLite row), so
+    # lat/lon are rounded floats or None and lastAttemptTs is an epoch float or None
+
+    # 2. Already has lat/lon -> use it
+    lat = cached["lat"]
+    lon = cached["lon"]
+    if lat is not None and lon is not None:
+        return {"lat": lat, "lon": lon}, False
+
+    # 3. Failed before -> retry only once the retry interval has passed
+    last_attempt = cached["lastAttemptTs"]
+    if last_attempt is None:
+        return None, True
+    return None, (time.time() - last_attempt) > FAILED_RETRY_INTERVAL_SECONDS
 
 
 def split_intersection(address: str) -> Optional[tuple[str, str]]:
@@ -137,7 +275,9 @@ def split_intersection(address: str) -> Optional[tuple[str, str]]:
     return pieces[0], pieces[1]
 
 
-def build_geocode_queries(address: str) -> List[str]:
+@lru_cache(maxsize=4096)
+def build_geocode_queries(address: str) -> tuple[str, ...]:
+    # Memoized because failed addresses are retried with the same queries
     queries: List[str] = [address]
     intersection = split_intersection(address)
     if intersection:
@@ -145,71 +285,252 @@ def build_geocode_queries(address: str) -> List[str]:
         queries.append(f"{first} and {second}, Dallas, TX")
         queries.append(f"{first}, Dallas, TX")
         queries.append(f"{second}, Dallas, TX")
-    
-    deduped: List[str] = []
-    for query in queries:
-        if query not in deduped:
-            deduped.append(query)
-    return deduped
+
+    return tuple(dict.fromkeys(queries))
+
+
+def to_client_call(
+    call: dict[str, Any],
+    address_memo: Optional[dict[tuple[str, str], AddressLookup]] = None,
+) -> ClientCall:
+    """Projects a raw Dallas row for the client.
+
+    `address_memo` is shared across one fetch so rows at the same block and
+    location reuse the built address and cache lookup; its entries also
+    record which addresses still need geocoding.
+    """
+    ns = normalize_space  # Local alias: called a dozen times per row
+    get = call.get
+    block = ns(get("block"))
+    location = ns(get("location"))
+    memo_key = (block, location)
+    if address_memo is not None and memo_key in address_memo:
+        address, geo, _ = address_memo[memo_key]
+    else:
+        address = build_address(block, location)
+        geo, needs_geocode = lookup_geocode(address)
+        if address_memo is not None:
+            address_memo[memo_key] = (address, geo, needs_geocode)
+    return ClientCall(
+        **{out: ns(get(src)) for out, src in CLIENT_TEXT_FIELDS},
+        block=block,
+        location=location,
+        address=address,
+        lat=geo["lat"] if geo else None,
+        lon=geo["lon"] if geo else None,
+    )
+
+
+def invalidate_calls_payload():
+    """Drops the cached /api/calls body; the next request rebuilds it.
+
+    Geocode results can land every second or so, faster than clients poll,
+    so serializing lazily avoids encoding snapshots nobody reads.
+    """
+    STATE.calls_payload_bytes = None
+    STATE.calls_payload_etag = None
+    STATE.calls_payload_gzip = None
+
+
+def rebuild_calls_payload():
+    """Serializes the /api/calls response once; call with STATE.lock held."""
+    calls = STATE.calls
+    STATE.calls_payload_bytes = dumps_json({
+        "updatedAt": STATE.last_updated_at,
+        "totalCalls": len(calls),
+        "mappedCalls": STATE.mapped_count,
+        "unmappedCalls": len(calls) - STATE.mapped_count,
+        "geocodeAttemptsThisRun": STATE.geocode_attempts_this_run,
+        "error": STATE.last_error,
+        "calls": calls,
+    })
+    digest = hashlib.blake2b(STATE.calls_payload_bytes, digest_size=8).hexdigest()
+    STATE.calls_payload_etag = f'"{digest}"'
+    # Keys repeat on every row, so this compresses ~10x; done once per snapshot
+    STATE.calls_payload_gzip = gzip.compress(STATE.calls_payload_bytes, compresslevel=6)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        quality = params.strip().lower()
+        return not quality.startswith("q=") or safe_float(quality[2:]) != 0
+    return False
+
+
+CACHE_COLUMNS = "key, lat, lon, label, provider, last_attempt, updated_at"
+_db_local = threading.local()
+
+
+def get_cache_db() -> sqlite3.Connection:
+    """Per-thread connection: the flusher writes from worker threads."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(CACHE_DB)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, lat REAL, lon REAL, label TEXT, provider TEXT, "
+            "last_attempt REAL, updated_at REAL)"
+        )
+        _db_local.conn = conn
+    return conn
 
 
-def to_client_call(call: dict[str, Any]) -> dict[str, Any]:
-    address = build_address(call)
-    geo = read_geo_from_cache(address)
-    return {
-        "incidentNumber": normalize_space(call.get("incident_number")),
-        "division": normalize_space(call.get("division")),
-        "natureOfCall": normalize_space(call.get("nature_of_call")),
-        "priority": normalize_space(call.get("priority")),
-        "date": normalize_space(call.get("date")),
-        "time": normalize_space(call.get("time")),
-        "unitNumber": normalize_space(call.get("unit_number")),
-        "block": normalize_space(call.get("block")),
-        "location": normalize_space(call.get("location")),
-        "beat": normalize_space(call.get("beat")),
-        "reportingArea": normalize_space(call.get("reporting_area")),
-        "status": normalize_space(call.get("status")),
-        "address": address,
-        "lat": geo["lat"] if geo else None,
-        "lon": geo["lon"] if geo else None,
-        "geocodeLabel": geo["geocodeLabel"] if geo else "",
+def timestamp_to_iso(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def round_coord(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, COORD_DECIMALS)
+
+
+def cache_entry_to_row(key: str, entry: dict[str, Any]) -> tuple:
+    """Validates an entry into column values; legacy JSON entries are
+    normalized here once, so lookups can trust what they read back."""
+    last_attempt = safe_float(entry.get("lastAttemptTs"))
+    if last_attempt is None:
+        last_attempt = parse_iso(entry.get("lastAttempt") or entry.get("updatedAt"))
+    return (
+        key,
+        round_coord(safe_float(entry.get("lat"))),
+        round_coord(safe_float(entry.get("lon"))),
+        str(entry.get("label") or ""),
+        str(entry.get("provider") or ""),
+        last_attempt,
+        parse_iso(entry.get("updatedAt")),
+    )
+
+
+def cache_row_to_entry(row: tuple) -> tuple[str, dict[str, Any]]:
+    key, lat, lon, label, provider, last_attempt, updated_at = row
+    return key, {
+        # Rows written before coordinates were rounded are rounded on load
+        "lat": round_coord(lat),
+        "lon": round_coord(lon),
+        "label": label or "",
+        "provider": provider or "",
+        "lastAttempt": timestamp_to_iso(last_attempt),
+        "lastAttemptTs": last_attempt,
+        "updatedAt": timestamp_to_iso(updated_at),
     }
 
 
-def persistence_sync():
-    """Synchronous file write for simplicity, or could be async aiofiles."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+def persistence_sync(entries: dict[str, dict[str, Any]]) -> bool:
+    """Upserts changed cache entries, one row each, in a single transaction.
+
+    Returns False if the write failed, so the caller can re-queue the keys.
+    """
+    if not entries:
+        return True
     try:
-        serialized = json.dumps(STATE.geocode_cache, indent=2)
-        CACHE_FILE.write_text(serialized, encoding="utf-8")
+        conn = get_cache_db()
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO cache ({CACHE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [cache_entry_to_row(key, entry) for key, entry in entries.items()],
+            )
     except Exception as e:
         print(f"Failed to persist cache: {e}")
+        return False
+    return True
+
+
+def import_legacy_json_cache() -> dict[str, dict[str, Any]]:
+    """Reads the pre-SQLite geocode-cache.json, if one is lying around."""
+    if not LEGACY_CACHE_FILE.exists():
+        return {}
+    try:
+        raw = LEGACY_CACHE_FILE.read_bytes()
+        parsed = loads_json(raw)
+    except Exception as e:
+        print(f"Unable to read legacy geocode cache: {e}")
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    return {key: entry for key, entry in parsed.items() if isinstance(entry, dict)}
 
 
 def load_cache_sync():
-    if not CACHE_FILE.exists():
-        return
     try:
-        raw = CACHE_FILE.read_text(encoding="utf-8")
-        parsed = json.loads(raw)
-        if isinstance(parsed, dict):
-            STATE.geocode_cache = parsed
-            print(f"Loaded {len(STATE.geocode_cache)} geocoded locations.")
+        conn = get_cache_db()
+        if conn.execute("SELECT 1 FROM cache LIMIT 1").fetchone() is None:
+            persistence_sync(import_legacy_json_cache())
+        rows = conn.execute(f"SELECT {CACHE_COLUMNS} FROM cache").fetchall()
+        STATE.geocode_cache = dict(cache_row_to_entry(row) for row in rows)
+        print(f"Loaded {len(STATE.geocode_cache)} geocoded locations.")
     except Exception as e:
         print(f"Unable to load geocode cache: {e}")
 
 
+def mark_cache_dirty(key: str):
+    """Record a cache write; the flusher task persists it in batches."""
+    if STATE.dirty_since is None:
+        STATE.dirty_since = time.time()
+    STATE.dirty_keys.add(key)
+    STATE.writes_since_flush += 1
+
+
+def take_dirty_cache_snapshot() -> Optional[dict[str, dict[str, Any]]]:
+    """Returns the changed entries to persist, or None if nothing changed.
+
+    Call with STATE.lock held. Entries are replaced, never mutated, so the
+    returned dict stays stable while a worker thread writes it.
+    """
+    if STATE.dirty_since is None:
+        return None
+    snapshot = {key: STATE.geocode_cache[key] for key in STATE.dirty_keys}
+    STATE.dirty_since = None
+    STATE.dirty_keys = set()
+    STATE.writes_since_flush = 0
+    return snapshot
+
+
+def restore_dirty_keys(keys: Iterable[str]):
+    """Re-queues keys from a failed flush so the next one retries them.
+
+    Call with STATE.lock held. writes_since_flush is left alone, so a failing
+    disk is retried on the PERSIST_MAX_DIRTY_SECONDS timer, not every check.
+    """
+    if STATE.dirty_since is None:
+        STATE.dirty_since = time.time()
+    STATE.dirty_keys.update(keys)
+
+
+def flush_cache_if_dirty():
+    snapshot = take_dirty_cache_snapshot()
+    if snapshot is not None and not persistence_sync(snapshot):
+        restore_dirty_keys(snapshot)
+
+
 # --- Async Actions ---
 
+def create_http_client() -> httpx.AsyncClient:
+    """One pooled client shared by the fetch loop and geocode workers."""
+    # retries only re-attempts failed connects (DNS/TCP/TLS), never a sent request
+    transport = httpx.AsyncHTTPTransport(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=90),
+        retries=2,
+    )
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(25.0, connect=5.0),
+        headers={"Accept": "application/json", "User-Agent": GEOCODER_USER_AGENT},
+    )
+
+
 async def fetch_active_calls(client: httpx.AsyncClient) -> List[dict[str, Any]]:
     try:
-        resp = await client.get(
-            DALLAS_CALLS_URL,
-            headers={"Accept": "application/json", "User-Agent": GEOCODER_USER_AGENT},
-            timeout=25.0
-        )
+        resp = await client.get(DALLAS_CALLS_URL)
         resp.raise_for_status()
-        rows = resp.json()
+        rows = loads_json(resp.content)
         if not isinstance(rows, list):
             raise ValueError("Response is not a list")
         return rows
@@ -218,6 +539,15 @@ async def fetch_active_calls(client: httpx.AsyncClient) -> List[dict[str, Any]]:
         return []
 
 
+async def wait_for_geocode_slot():
+    """Blocks until the next Nominatim request may start, across all callers."""
+    async with STATE.geocode_rate_lock:
+        wait = STATE.last_geocode_request_at + GEOCODE_DELAY_SECONDS - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        STATE.last_geocode_request_at = time.monotonic()
+
+
 async def nominatim_lookup(client: httpx.AsyncClient, query: str) -> Optional[dict[str, Any]]:
     params = {
         "format": "jsonv2",
@@ -226,20 +556,17 @@ async def nominatim_lookup(client: httpx.AsyncClient, query: str) -> Optional[di
         "q": query,
     }
     url = "https://nominatim.openstreetmap.org/search"
+    await wait_for_geocode_slot()
     try:
         resp = await client.get(
             url,
             params=params,
-            headers={
-                "Accept": "application/json",
-                "Accept-Language": "en-US",
-                "User-Agent": GEOCODER_USER_AGENT
-            },
+            headers={"Accept-Language": "en-US"},
             timeout=10.0
         )
         if resp.status_code != 200:
             return None
-        rows = resp.json()
+        rows = loads_json(resp.content)
         if not isinstance(rows, list) or not rows:
             return None
         
@@ -271,10 +598,6 @@ async def geocode_address(client: httpx.AsyncClient, address: str) -> Optional[d
                     "lon": (street_fallback_results[0]["lon"] + street_fallback_results[1]["lon"]) / 2,
                     "label": "Approximate intersection midpoint (street fallback)",
                 }
-        
-        # Polite delay between internal retries
-        if index < len(queries) - 1:
-            await asyncio.sleep(GEOCODE_DELAY_SECONDS)
 
     if len(street_fallback_results) == 1:
         return {
@@ -285,111 +608,151 @@ async def geocode_address(client: httpx.AsyncClient, address: str) -> Optional[d
     return None
 
 
-async def should_attempt_geocode(address: Optional[str]) -> bool:
-    if not address:
-        return False
-    
-    key = get_cache_key(address)
-    cached = STATE.geocode_cache.get(key)
-    
-    # 1. New address -> Yes
-    if not cached:
-        return True
-    
-    # 2. Already has lat/lon -> No
-    lat = safe_float(cached.get("lat"))
-    lon = safe_float(cached.get("lon"))
-    if lat is not None and lon is not None:
-        return False
-
-    # 3. Failed recently? -> No (Retry interval)
-    last_attempt = parse_iso(cached.get("lastAttempt") or cached.get("updatedAt"))
-    if last_attempt is None:
-        return True
-    
-    return (time.time() - last_attempt) > FAILED_RETRY_INTERVAL_SECONDS
-
-
-async def call_fetch_loop():
-    """Fetches active calls from Dallas Open Data periodically."""
-    async with httpx.AsyncClient() as client:
-        while True:
-            try:
-                raw_calls = await fetch_active_calls(client)
-                
-                # Transform and update state
-                next_state = [to_client_call(row) for row in raw_calls]
-                
-                async with STATE.lock:
-                    STATE.calls = next_state
-                    STATE.last_updated_at = utc_now_iso()
-                    STATE.last_error = None
-                
-            except Exception as e:
-                print(f"Data fetch loop error: {e}")
-                async with STATE.lock:
-                    STATE.last_error = str(e)
-            
-            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+def index_calls_by_address(calls: List[ClientCall]) -> tuple[dict[str, List[int]], int]:
+    """One pass over a new snapshot: cache key -> row indexes, plus the
+    number of mapped rows. Each distinct address is normalized once."""
+    index: dict[str, List[int]] = {}
+    keys: dict[str, str] = {}
+    mapped = 0
+    for position, call in enumerate(calls):
+        if call.lat is not None:
+            mapped += 1
+        address = call.address
+        if not address:
+            continue
+        key = keys.get(address)
+        if key is None:
+            key = keys[address] = get_cache_key(address)
+        index.setdefault(key, []).append(position)
+    return index, mapped
+
+
+def enqueue_geocode_candidates(address_memo: dict[tuple[str, str], AddressLookup]):
+    """Queues each unique address flagged by lookup_geocode; call with STATE.lock held."""
+    for address, _, needs_geocode in address_memo.values():
+        if not needs_geocode:
+            continue
+        key = get_cache_key(address)
+        if key in STATE.geocode_pending:
+            continue
+        STATE.geocode_pending.add(key)
+        STATE.geocode_queue.put_nowait(address)
+
+
+async def fetch_and_update(client: httpx.AsyncClient):
+    """Fetches active calls from Dallas Open Data once and swaps in the new snapshot."""
+    STATE.refresh_in_flight = True
+    try:
+        raw_calls = await fetch_active_calls(client)
+
+        # Transform and update state
+        address_memo: dict[tuple[str, str], AddressLookup] = {}
+        next_state = [to_client_call(row, address_memo) for row in raw_calls]
+        next_index, next_mapped = index_calls_by_address(next_state)
+
+        async with STATE.lock:
+            STATE.calls = next_state
+            STATE.call_index = next_index
+            STATE.mapped_count = next_mapped
+            STATE.last_updated_at = utc_now_iso()
+            STATE.last_error = None
+            invalidate_calls_payload()
+            enqueue_geocode_candidates(address_memo)
 
+    except Exception as e:
+        print(f"Data fetch loop error: {e}")
+        async with STATE.lock:
+            STATE.last_error = str(e)
+            invalidate_calls_payload()
+    finally:
+        STATE.refresh_in_flight = False
+
+
+async def call_fetch_loop(client: httpx.AsyncClient):
+    """Refreshes calls every REFRESH_INTERVAL_MS, or sooner when /api/refresh asks."""
+    while True:
+        await fetch_and_update(client)
+        try:
+            await asyncio.wait_for(STATE.refresh_requested.wait(), REFRESH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        STATE.refresh_requested.clear()
+
+
+async def geocode_worker_loop(client: httpx.AsyncClient):
+    """Geocodes queued addresses one at a time; nominatim_lookup enforces rate limits."""
+    while True:
+        target_address = await STATE.geocode_queue.get()
+        target_key = get_cache_key(target_address)
+
+        try:
+            result = await geocode_address(client, target_address)
+
+            now = utc_now_iso()
+            if result:
+                result["lat"] = round(result["lat"], COORD_DECIMALS)
+                result["lon"] = round(result["lon"], COORD_DECIMALS)
+            entry = {
+                "lat": result["lat"] if result else None,
+                "lon": result["lon"] if result else None,
+                "label": result.get("label", "") if result else "",
+                "provider": "nominatim",
+                "lastAttempt": now,
+                "lastAttemptTs": time.time(),
+                "updatedAt": now,
+            }
+
+            geo = None
+            if result:
+                geo = {"lat": result["lat"], "lon": result["lon"]}
 
-async def geocode_worker_loop():
-    """Continuously finds one unmapped address and geocodes it, obeying rate limits."""
-    # We use a distinct client for geocoding to keep connections separate
-    async with httpx.AsyncClient() as client:
-        while True:
-            target_address = None
-            
-            # 1. Find a candidate
             async with STATE.lock:
-                # Prioritize calls that are currently active but have no coordinates
-                for call in STATE.calls:
-                    addr = call.get("address")
-                    # We check the cache directly here to see if we should work on it
-                    # (The 'call' object might be slightly stale if cache updated in bg, 
-                    # but should_attempt_geocode checks the live cache)
-                    if await should_attempt_geocode(addr):
-                        target_address = addr
-                        break
-            
-            # 2. Work on it
-            if target_address:
-                try:
-                    result = await geocode_address(client, target_address)
-                    
-                    now = utc_now_iso()
-                    entry = {
-                        "lat": result["lat"] if result else None,
-                        "lon": result["lon"] if result else None,
-                        "label": result.get("label", "") if result else "",
-                        "provider": "nominatim",
-                        "lastAttempt": now,
-                        "updatedAt": now,
-                    }
-                    
-                    async with STATE.lock:
-                        STATE.geocode_cache[get_cache_key(target_address)] = entry
-                        STATE.geocode_attempts_this_run += 1 # Just a counter for stats
-                    
-                    persistence_sync()
-                    
-                    # Update the in-memory STATE.calls to reflect new coords immediately if present
-                    # (Optional optimization: waiting for next fetch loop is also fine, 
-                    # but immediate feedback is nicer)
-                    async with STATE.lock:
-                        for call in STATE.calls:
-                            if get_cache_key(call.get("address") or "") == get_cache_key(target_address):
-                                call.update(read_geo_from_cache(target_address) or {})
-
-                except Exception as e:
-                    print(f"Geocode worker error for {target_address}: {e}")
-                
-                # 3. Rate Limit Delay
-                # Strict 1 second delay between requests to be safe
-                await asyncio.sleep(1.1)
-            else:
-                # No work needed, sleep a bit longer
-                await asyncio.sleep(2.0)
+                STATE.geocode_cache[target_key] = entry
+                STATE.geocode_attempts_this_run += 1 # Just a counter for stats
+                mark_cache_dirty(target_key)
+                STATE.geocode_pending.discard(target_key)
+
+                # Update the in-memory STATE.calls to reflect new coords immediately if present
+                # (Optional optimization: waiting for next fetch loop is also fine,
+                # but immediate feedback is nicer). Snapshots are never mutated in
+                # place: matching rows are copied into a new list that replaces the old.
+                positions = STATE.call_index.get(target_key)
+                if geo and positions:
+                    next_calls = list(STATE.calls)
+                    for position in positions:
+                        call = next_calls[position]
+                        if call.lat is None:
+                            STATE.mapped_count += 1
+                        next_calls[position] = replace(call, **geo)
+                    STATE.calls = next_calls
+                invalidate_calls_payload()
+
+        except Exception as e:
+            print(f"Geocode worker error for {target_address}: {e}")
+            async with STATE.lock:
+                STATE.geocode_pending.discard(target_key)
+        finally:
+            STATE.geocode_queue.task_done()
+
+
+async def persistence_flusher():
+    """Periodically writes the geocode cache to disk once enough changes pile up."""
+    while True:
+        await asyncio.sleep(PERSIST_CHECK_SECONDS)
+        async with STATE.lock:
+            if STATE.dirty_since is None:
+                continue
+            due = (
+                STATE.writes_since_flush >= PERSIST_MAX_PENDING_WRITES
+                or time.time() - STATE.dirty_since > PERSIST_MAX_DIRTY_SECONDS
+            )
+            snapshot = take_dirty_cache_snapshot() if due else None
+        if snapshot is not None:
+            # Serialize and write on a worker thread so geocode workers and
+            # API requests keep running meanwhile
+            if not await asyncio.to_thread(persistence_sync, snapshot):
+                async with STATE.lock:
+                    restore_dirty_keys(snapshot)
 
 
 # --- FastAPI App ---
@@ -398,47 +761,130 @@ async def geocode_worker_loop():
 async def lifespan(app: FastAPI):
     # Startup
     load_cache_sync()
-    asyncio.create_task(call_fetch_loop())
-    asyncio.create_task(geocode_worker_loop())
+    client = create_http_client()
+    asyncio.create_task(call_fetch_loop(client))
+    # Workers share the Nominatim rate limiter, so more of them only overlap
+    # network round-trips; they never exceed the request budget
+    for _ in range(GEOCODE_WORKERS):
+        asyncio.create_task(geocode_worker_loop(client))
+    asyncio.create_task(persistence_flusher())
     yield
     # Shutdown
-    persistence_sync()
+    flush_cache_if_dirty()
+    await client.aclose()
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json (orjson when installed)."""
 
-app = FastAPI(title="Dallas PD Active Calls Map", lifespan=lifespan)
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+app = FastAPI(
+    title="Dallas PD Active Calls Map",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 @app.get("/api/calls")
-async def get_calls():
-    async with STATE.lock:
-        calls_copy = [dict(c) for c in STATE.calls]
-        updated_at = STATE.last_updated_at
-        error = STATE.last_error
-        attempts = STATE.geocode_attempts_this_run
-        
-    mapped = [c for c in calls_copy if safe_float(c.get("lat")) is not None]
-    
+async def get_calls(request: Request):
+    if STATE.calls_payload_bytes is None:
+        async with STATE.lock:
+            if STATE.calls_payload_bytes is None:
+                rebuild_calls_payload()
+    # Read these together; they are always replaced as a set under the lock
+    payload, etag = STATE.calls_payload_bytes, STATE.calls_payload_etag
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        payload, etag = STATE.calls_payload_gzip, etag[:-1] + '-gzip"'
+        headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+@app.get("/api/label/{incident_number}")
+async def get_label(incident_number: str):
+    """Geocoder display name for an incident, kept out of /api/calls to save bytes."""
+    call = next((c for c in STATE.calls if c.incidentNumber == incident_number), None)
+    if call is None:
+        raise HTTPException(status_code=404, detail="Unknown incident")
+    cached = STATE.geocode_cache.get(get_cache_key(call.address or ""))
     return {
-        "updatedAt": updated_at,
-        "totalCalls": len(calls_copy),
-        "mappedCalls": len(mapped),
-        "unmappedCalls": len(calls_copy) - len(mapped),
-        "geocodeAttemptsThisRun": attempts,
-        "error": error,
-        "calls": calls_copy
+        "incidentNumber": incident_number,
+        "address": call.address,
+        "geocodeLabel": cached["label"] if cached else "",
     }
 
 @app.get("/api/refresh")
 async def trigger_refresh():
-    # Trigger background fetch immediately
-    asyncio.create_task(call_fetch_loop())
+    # A fetch already running will deliver fresh data; queuing another right
+    # behind it would just hit the Dallas API twice
+    if STATE.refresh_in_flight:
+        return FastJSONResponse({"status": "refresh_in_flight"}, status_code=202)
+    # Wake the fetch loop early instead of starting another one
+    STATE.refresh_requested.set()
     return {"status": "refresh_triggered"}
 
 @app.get("/health")
 async def health():
     return {"status": "ok", "uptime_check": True}
 
-# Serve static files
-app.mount("/", StaticFiles(directory=str(PUBLIC_DIR), html=True), name="public")
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that serves small assets from memory and sets Cache-Control.
+
+    Starlette already answers If-None-Match / If-Modified-Since with 304;
+    this skips re-reading unchanged files (keyed on path + mtime) otherwise.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._memory_cache: dict[str, tuple[float, bytes]] = {}
+
+    def file_response(
+        self,
+        full_path: "str | os.PathLike[str]",
+        stat_result: os.stat_result,
+        scope: Any,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        if not isinstance(response, FileResponse) or stat_result.st_size > STATIC_MEMORY_CACHE_MAX_BYTES:
+            return response
+        # FileResponse handles Range (206) itself; the in-memory copy is whole-file only
+        if "range" in Headers(scope=scope):
+            return response
+
+        key = str(full_path)
+        cached = self._memory_cache.get(key)
+        if cached is None or cached[0] != stat_result.st_mtime:
+            cached = (stat_result.st_mtime, Path(full_path).read_bytes())
+            self._memory_cache[key] = cached
+        headers = {
+            k: v for k, v in response.headers.items() if k not in ("content-length", "accept-ranges")
+        }
+        return Response(content=cached[1], status_code=status_code, headers=headers)
+
+
+# Serve static files. follow_symlink=True makes Starlette confine paths with a
+# lexical abspath/commonpath check instead of realpath(), which costs
+# readlink/stat syscalls per path component on every request. PUBLIC_DIR is
+# resolved once here, so the confinement check compares real paths.
+app.mount(
+    "/",
+    CachedStaticFiles(directory=str(PUBLIC_DIR.resolve()), html=True, follow_symlink=True),
+    name="public",
+)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("server:app", host=HOST, port=PORT, reload=True)
+    uvicorn.run(
+        "server:app",
+        host=HOST,
+        port=PORT,
+        reload=RELOAD,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+    )